@@ -1,20 +1,54 @@
-import os
+from __future__ import annotations
+
+import queue
 import sys
-from rich.console import Console
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.prompt import Prompt
-from rich.spinner import Spinner
-from rich.style import Style
-from dotenv import load_dotenv
+from rich.live import Live
+from rich.text import Text
 
 from utils.openrouter import UniversalLLMClient
+from utils.semcache import SemCache
 from utils.commands import handle_command
-from utils.ui import format_ai_response, create_chat_header
-from utils.env_manager import EnvManager, CUSTOM_REPLIES
+from utils.ui import CONSOLE, format_ai_response, create_chat_header, has_markdown_syntax
+from utils.env_manager import EnvManager, CUSTOM_REPLIES, CUSTOM_REPLY_MAX_LEN
+from utils.history import ChatHistory
+from utils.history_store import get_store
+
+# The shared console singleton (see utils.ui)
+console = CONSOLE
+
+# Worker thread for cache embedding so it overlaps the network/render path
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Expected time-to-first-token per provider (exponential moving average);
+# the thinking spinner is skipped for providers faster than the threshold
+_FIRST_TOKEN_EMA = {}
+_SPINNER_THRESHOLD_S = 0.25
+
+# Whether a failed background cache write has already been reported
+_cache_put_warned = False
+
+def _warn_cache_put_failure(future) -> None:
+    """
+    Report the first failed background cache write
+
+    Cache updates run fire-and-forget on the executor, so without a done
+    callback their exceptions would be dropped unobserved. Only the first
+    failure is printed to keep the chat output quiet.
 
-# Initialize console
-console = Console()
+    Args:
+        future: The completed cache-put future
+    """
+    global _cache_put_warned
+    exc = future.exception()
+    if exc is not None and not _cache_put_warned:
+        _cache_put_warned = True
+        console.print(f"[dim yellow]Warning: semantic cache update failed: {exc}[/dim yellow]")
 
 def initialize_client(env_manager: EnvManager):
     """
@@ -41,8 +75,44 @@ def initialize_client(env_manager: EnvManager):
     
     return UniversalLLMClient(provider_config)
 
+def _render_stream(chunks: "queue.SimpleQueue", live: Live) -> None:
+    """
+    Render streamed chunks from a queue into a live display
+
+    Coalesces every chunk that has already arrived before each redraw, so
+    the rendering rate is decoupled from the token arrival rate.
+
+    Args:
+        chunks: Queue of text chunks; None marks the end of the stream
+        live: Live display to update
+    """
+    buf = ""
+    done = False
+
+    while not done:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        buf += chunk
+
+        # Drain whatever else is already queued before redrawing
+        try:
+            while True:
+                extra = chunks.get_nowait()
+                if extra is None:
+                    done = True
+                    break
+                buf += extra
+        except queue.Empty:
+            pass
+
+        live.update(Text(buf))
+
 def main():
     """Main function to run the chatbot"""
+    # Imported here so startup cost is only paid once we actually run
+    from dotenv import load_dotenv
+
     # Initialize environment manager
     env_manager = EnvManager()
     
@@ -77,15 +147,26 @@ def main():
             )
         )
     
-    # Chat history
-    chat_history = []
+    # Chat history, bounded so long sessions don't grow the prompt forever
+    chat_history = ChatHistory(max_tokens=6000)
+
+    # Disk-backed session log, so /resume can restore after a crash
+    history_store = get_store()
+
+    # Semantic response caches, one per provider to avoid cross-model staleness
+    semantic_caches = {}
     
     # Main chat loop
     while True:
         user_input = Prompt.ask("\n[bold green]You[/bold green]")
-        
-        # Check if this is a command
-        if user_input.startswith("/"):
+
+        # Nothing to do for empty input
+        stripped_input = user_input.strip()
+        if not stripped_input:
+            continue
+
+        # Check if this is a command (input is known non-empty here)
+        if user_input[0] == "/":
             command_result = handle_command(user_input, console, chat_history, env_manager)
             
             if command_result == "exit":
@@ -116,12 +197,14 @@ def main():
                     )
             continue
         
-        # Check for custom replies (to save tokens)
-        user_input_lower = user_input.lower().strip()
-        if user_input_lower in CUSTOM_REPLIES:
-            console.print("\n[bold purple]AI Assistant[/bold purple]")
-            format_ai_response(CUSTOM_REPLIES[user_input_lower], console)
-            continue
+        # Check for custom replies (to save tokens); inputs longer than the
+        # longest key can't match, so skip the normalization for them
+        if len(stripped_input) <= CUSTOM_REPLY_MAX_LEN:
+            reply = CUSTOM_REPLIES.get(stripped_input.lower())
+            if reply is not None:
+                console.print("\n[bold purple]AI Assistant[/bold purple]")
+                format_ai_response(reply, console)
+                continue
             
         # Check if client is available
         if not client:
@@ -134,25 +217,93 @@ def main():
             )
             continue
         
-        # Display thinking spinner
-        with console.status("[blue]AI is thinking...", spinner="dots"):
-            # Append user message to history
+        # Check the semantic cache before paying for a network round-trip.
+        # The lookup goes through the single-worker executor so it queues
+        # behind any still-running cache write from the previous turn;
+        # SemCache is not thread-safe, so do not "simplify" this to a
+        # direct call
+        semcache = semantic_caches.setdefault(client.provider_name, SemCache())
+        cache_future = _EXECUTOR.submit(semcache.get, user_input)
+        cached = cache_future.result()
+        if cached is not None:
             chat_history.append({"role": "user", "content": user_input})
-            
-            # Get response from AI
-            try:
-                response = client.get_response(chat_history)
-                chat_history.append({"role": "assistant", "content": response})
-                
-                # Display the formatted response
-                console.print("\n[bold purple]AI Assistant[/bold purple]")
-                format_ai_response(response, console)
-                
-            except Exception as e:
-                console.print(f"\n[bold red]Error:[/bold red] {str(e)}")
-                # Remove the failed user message from history
-                if chat_history and chat_history[-1]["role"] == "user":
-                    chat_history.pop()
+            chat_history.append({"role": "assistant", "content": cached})
+            history_store.append_turn((
+                {"role": "user", "content": user_input},
+                {"role": "assistant", "content": cached},
+            ))
+            console.print("\n[bold purple]AI Assistant[/bold purple]")
+            format_ai_response(cached, console)
+            continue
+
+        # Append user message to history
+        chat_history.append({"role": "user", "content": user_input})
+
+        # Stream the response from the AI, rendering chunks as they arrive
+        try:
+            console.print("\n[bold purple]AI Assistant[/bold purple]")
+
+            stream = client.stream_response(chat_history.to_list())
+
+            # Only spin up the thinking indicator when this provider is
+            # expected to keep us waiting; fast providers skip it entirely
+            expected = _FIRST_TOKEN_EMA.get(client.provider_name)
+            start = time.monotonic()
+            if expected is None or expected > _SPINNER_THRESHOLD_S:
+                with console.status("[blue]AI is thinking...", spinner="dots"):
+                    first_chunk = next(stream, "")
+            else:
+                first_chunk = next(stream, "")
+
+            # Track time-to-first-token per provider as a moving average
+            elapsed = time.monotonic() - start
+            previous = _FIRST_TOKEN_EMA.get(client.provider_name, elapsed)
+            _FIRST_TOKEN_EMA[client.provider_name] = 0.7 * previous + 0.3 * elapsed
+
+            response = first_chunk
+            with Live(Text(response), console=console, refresh_per_second=20) as live:
+                # Rendering happens on its own thread so the network loop
+                # keeps pulling tokens at line rate
+                chunks = queue.SimpleQueue()
+                renderer = threading.Thread(
+                    target=_render_stream, args=(chunks, live), daemon=True
+                )
+                renderer.start()
+                chunks.put(first_chunk)
+
+                try:
+                    for chunk in stream:
+                        response += chunk
+                        chunks.put(chunk)
+                finally:
+                    chunks.put(None)
+                    renderer.join()
+
+                # Upgrade to full Markdown once the stream is complete
+                if has_markdown_syntax(response):
+                    live.update(Markdown(response))
+
+            # Only record the assistant turn once the stream completed;
+            # cache population (embedding included) happens off the hot path
+            chat_history.append({"role": "assistant", "content": response})
+            history_store.append_turn((
+                {"role": "user", "content": user_input},
+                {"role": "assistant", "content": response},
+            ))
+            put_future = _EXECUTOR.submit(semcache.put, user_input, response)
+            put_future.add_done_callback(_warn_cache_put_failure)
+
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Response cancelled.[/yellow]")
+            # Drop the interrupted turn so history stays consistent
+            if chat_history and chat_history[-1]["role"] == "user":
+                chat_history.pop()
+
+        except Exception as e:
+            console.print(f"\n[bold red]Error:[/bold red] {str(e)}")
+            # Remove the failed user message from history
+            if chat_history and chat_history[-1]["role"] == "user":
+                chat_history.pop()
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,19 @@
 """
 Command handler for TermChat
 """
+import json
 import random
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from itertools import islice
+from typing import List, Dict, Optional
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.table import Table
+from rich.text import Text
+
+# Most recent messages shown by /history
+HISTORY_DISPLAY_LIMIT = 50
 
 # Jokes for the /joke command
 JOKES = [
@@ -20,80 +27,210 @@ JOKES = [
     "Why do programmers hate nature? Too many bugs, not enough doc!"
 ]
 
-def handle_command(command: str, console: Console, chat_history: List[Dict[str, str]], 
+def _build_help_table() -> Table:
+    """Build the help table listing all available commands"""
+    table = Table(title="Available Commands", box=None)
+    table.add_column("Command", style="bold cyan")
+    table.add_column("Description")
+
+    table.add_row("/help", "Show this help message")
+    table.add_row("/exit", "Exit the chatbot")
+    table.add_row("/clear", "Clear the chat history and screen")
+    table.add_row("/joke", "Tell a random programming joke")
+    table.add_row("/history", "Show your chat history")
+    table.add_row("/resume", "Restore the previous session's history")
+    table.add_row("/addapi", "Add a new LLM provider API key")
+    table.add_row("/switch", "Switch active LLM provider")
+    table.add_row("/deleteapi", "Delete a saved API key")
+    table.add_row("/batch", "Run a JSONL file of prompts and save the results")
+
+    return table
+
+# Static panels built once at import instead of on every invocation
+_HELP_PANEL = Panel(_build_help_table(), border_style="blue", title="Help")
+_GOODBYE_PANEL = Panel("Thank you for using TermChat! Goodbye!", border_style="green")
+_JOKE_PANELS = [Panel(joke, border_style="yellow", title="Joke") for joke in JOKES]
+
+def requires_env_manager(handler):
+    """
+    Decorator for command handlers that need the environment manager
+
+    Args:
+        handler: The command handler to wrap
+
+    Returns:
+        Handler that errors out cleanly when no env manager is available
+    """
+    @wraps(handler)
+    def wrapper(args, console, chat_history, env_manager):
+        if not env_manager:
+            console.print(Panel("[red]Error: Environment manager not available[/red]", border_style="red"))
+            return None
+        return handler(args, console, chat_history, env_manager)
+    return wrapper
+
+def _cmd_help(args, console, chat_history, env_manager) -> Optional[str]:
+    show_help(console)
+    return None
+
+def _cmd_exit(args, console, chat_history, env_manager) -> Optional[str]:
+    console.print(_GOODBYE_PANEL)
+    return "exit"
+
+def _cmd_clear(args, console, chat_history, env_manager) -> Optional[str]:
+    console.clear()
+    chat_history.clear()
+    return None
+
+def _cmd_joke(args, console, chat_history, env_manager) -> Optional[str]:
+    console.print(random.choice(_JOKE_PANELS))
+    return None
+
+def _cmd_history(args, console, chat_history, env_manager) -> Optional[str]:
+    show_history(console, chat_history)
+    return None
+
+def _cmd_resume(args, console, chat_history, env_manager) -> Optional[str]:
+    # Imported here so the store (and its database) is only opened on use
+    from utils.history_store import get_store
+
+    messages = get_store().last_session()
+    if not messages:
+        console.print(Panel("[yellow]No previous session found.[/yellow]",
+                           border_style="yellow"))
+        return None
+
+    chat_history.clear()
+    for message in messages:
+        chat_history.append(message)
+
+    console.print(Panel(
+        f"[bold green]✓[/bold green] Resumed previous session "
+        f"({len(messages)} messages).",
+        border_style="green"))
+    return None
+
+@requires_env_manager
+def _cmd_addapi(args, console, chat_history, env_manager) -> Optional[str]:
+    env_manager.add_api_key()
+    return "reload"  # Signal to reload the client
+
+@requires_env_manager
+def _cmd_switch(args, console, chat_history, env_manager) -> Optional[str]:
+    env_manager.switch_provider()
+    return "reload"  # Signal to reload the client
+
+@requires_env_manager
+def _cmd_deleteapi(args, console, chat_history, env_manager) -> Optional[str]:
+    env_manager.delete_api_key()
+    return "reload"  # Signal to reload the client
+
+@requires_env_manager
+def _cmd_batch(args, console, chat_history, env_manager) -> Optional[str]:
+    if not args:
+        console.print(Panel('Usage: /batch <file.jsonl> — one {"prompt": "..."} per line',
+                           border_style="red"))
+        return None
+
+    path = args[0]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            prompts = [json.loads(line)["prompt"] for line in f if line.strip()]
+    except (OSError, ValueError, KeyError) as e:
+        console.print(Panel(f"[red]Could not read batch file: {e}[/red]", border_style="red"))
+        return None
+
+    # Dedupe while preserving order so each unique prompt is billed once
+    prompts = list(dict.fromkeys(prompts))
+
+    if not prompts:
+        console.print(Panel("[yellow]No prompts found in the batch file.[/yellow]",
+                           border_style="yellow"))
+        return None
+
+    provider_config = env_manager.get_active_provider()
+    if not provider_config:
+        console.print(Panel("[yellow]No active provider configured.\n"
+                           "Please use /addapi and /switch first.[/yellow]",
+                           border_style="yellow"))
+        return None
+
+    # Imported here to avoid a module cycle with the main chat loop
+    from utils.openrouter import UniversalLLMClient
+    client = UniversalLLMClient(provider_config)
+
+    def run(prompt):
+        try:
+            response = client.get_response([{"role": "user", "content": prompt}])
+            return {"prompt": prompt, "response": response}
+        except Exception as e:
+            return {"prompt": prompt, "error": str(e)}
+
+    # Bounded concurrency keeps us under provider rate limits while still
+    # overlapping the network waits
+    with console.status(f"[blue]Running {len(prompts)} prompts..."):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(run, prompts))
+
+    out_path = f"{path}.out.jsonl"
+    with open(out_path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    failures = sum(1 for r in results if "error" in r)
+    console.print(Panel(
+        f"[bold green]✓[/bold green] {len(results) - failures}/{len(results)} prompts "
+        f"completed.\nResults written to [bold cyan]{out_path}[/bold cyan]",
+        border_style="green"))
+    return None
+
+# Command dispatch table: one hash lookup instead of an if/elif chain
+_COMMANDS = {
+    "/help": _cmd_help,
+    "/exit": _cmd_exit,
+    "/clear": _cmd_clear,
+    "/joke": _cmd_joke,
+    "/history": _cmd_history,
+    "/resume": _cmd_resume,
+    "/addapi": _cmd_addapi,
+    "/switch": _cmd_switch,
+    "/deleteapi": _cmd_deleteapi,
+    "/batch": _cmd_batch,
+}
+
+def handle_command(command: str, console: Console, chat_history: List[Dict[str, str]],
                    env_manager=None) -> Optional[str]:
     """
     Handle chat commands
-    
+
     Args:
         command: The command string (starting with /)
         console: Rich console instance
         chat_history: The chat history
         env_manager: Environment manager instance for API management
-        
+
     Returns:
         "exit" if the user wants to exit, "reload" to reload client, None otherwise
     """
-    cmd = command.split()[0].lower()
-    
-    if cmd == "/help":
-        show_help(console)
-    elif cmd == "/exit":
-        console.print(Panel("Thank you for using TermChat! Goodbye!", border_style="green"))
-        return "exit"
-    elif cmd == "/clear":
-        console.clear()
-        chat_history.clear()
-    elif cmd == "/joke":
-        joke = random.choice(JOKES)
-        console.print(Panel(joke, border_style="yellow", title="Joke"))
-    elif cmd == "/history":
-        show_history(console, chat_history)
-    elif cmd == "/addapi":
-        if env_manager:
-            env_manager.add_api_key()
-            return "reload"  # Signal to reload the client
-        else:
-            console.print(Panel("[red]Error: Environment manager not available[/red]", border_style="red"))
-    elif cmd == "/switch":
-        if env_manager:
-            env_manager.switch_provider()
-            return "reload"  # Signal to reload the client
-        else:
-            console.print(Panel("[red]Error: Environment manager not available[/red]", border_style="red"))
-    elif cmd == "/deleteapi":
-        if env_manager:
-            env_manager.delete_api_key()
-            return "reload"  # Signal to reload the client
-        else:
-            console.print(Panel("[red]Error: Environment manager not available[/red]", border_style="red"))
-    else:
-        console.print(Panel(f"Unknown command: {cmd}\nType /help to see available commands.", 
+    # Split off only the first token; the rest is parsed per handler
+    cmd, _, rest = command.partition(" ")
+    handler = _COMMANDS.get(cmd.lower())
+
+    if handler is None:
+        console.print(Panel(f"Unknown command: {cmd}\nType /help to see available commands.",
                            border_style="red"))
-    
-    return None
+        return None
+
+    return handler(rest.split(), console, chat_history, env_manager)
 
 def show_help(console: Console) -> None:
     """
     Show help information
-    
+
     Args:
         console: Rich console instance
     """
-    table = Table(title="Available Commands", box=None)
-    table.add_column("Command", style="bold cyan")
-    table.add_column("Description")
-    
-    table.add_row("/help", "Show this help message")
-    table.add_row("/exit", "Exit the chatbot")
-    table.add_row("/clear", "Clear the chat history and screen")
-    table.add_row("/joke", "Tell a random programming joke")
-    table.add_row("/history", "Show your chat history")
-    table.add_row("/addapi", "Add a new LLM provider API key")
-    table.add_row("/switch", "Switch active LLM provider")
-    table.add_row("/deleteapi", "Delete a saved API key")
-    
-    console.print(Panel(table, border_style="blue", title="Help"))
+    console.print(_HELP_PANEL)
 
 def show_history(console: Console, chat_history: List[Dict[str, str]]) -> None:
     """
@@ -110,16 +247,17 @@ def show_history(console: Console, chat_history: List[Dict[str, str]]) -> None:
     table = Table(title="Chat History", expand=True)
     table.add_column("Role", style="bold")
     table.add_column("Message")
-    
-    for message in chat_history:
+
+    # Only render the most recent messages so the table stays bounded
+    start = max(0, len(chat_history) - HISTORY_DISPLAY_LIMIT)
+    for message in islice(chat_history, start, None):
         role = message["role"]
-        content = message["content"]
-        
-        # Truncate very long messages for display
-        if len(content) > 100:
-            content = content[:97] + "..."
-        
+
+        # Width-aware truncation that won't split wide/emoji characters
+        content = Text(message["content"])
+        content.truncate(100, overflow="ellipsis")
+
         role_style = "green" if role == "user" else "purple"
         table.add_row(f"[{role_style}]{role.capitalize()}[/{role_style}]", content)
-    
+
     console.print(Panel(table, border_style="blue"))
\ No newline at end of file
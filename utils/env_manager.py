@@ -3,67 +3,119 @@ Environment and API key management for TermChat
 """
 import os
 import getpass
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Optional
-from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from dotenv import load_dotenv, set_key, unset_key
 
-# Supported LLM providers with their configuration
-LLM_PROVIDERS = {
-    "1": {
-        "name": "Google (Gemini)",
-        "env_key": "GOOGLE_API_KEY",
-        "api_url": "https://generativelanguage.googleapis.com/v1beta/models/",
-        "model": "gemini-2.5-pro"
-    },
-    "2": {
-        "name": "OpenRouter",
-        "env_key": "OPENROUTER_API_KEY",
-        "api_url": "https://openrouter.ai/api/v1/chat/completions",
-        "model": "openai/gpt-oss-20b:free"
-    },
-    "3": {
-        "name": "OpenAI",
-        "env_key": "OPENAI_API_KEY",
-        "api_url": "https://api.openai.com/v1/chat/completions",
-        "model": "gpt-3.5-turbo"
-    },
-    "4": {
-        "name": "Anthropic (Claude)",
-        "env_key": "ANTHROPIC_API_KEY",
-        "api_url": "https://api.anthropic.com/v1/messages",
-        "model": "claude-3-sonnet-20240229"
-    },
-    "5": {
-        "name": "xAI (Grok)",
-        "env_key": "XAI_API_KEY",
-        "api_url": "https://api.x.ai/v1/chat/completions",
-        "model": "grok-beta"
-    },
-    "6": {
-        "name": "DeepSeek",
-        "env_key": "DEEPSEEK_API_KEY",
-        "api_url": "https://api.deepseek.com/v1/chat/completions",
-        "model": "deepseek-chat"
-    },
-    "7": {
-        "name": "Qwen",
-        "env_key": "QWEN_API_KEY",
-        "api_url": "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation",
-        "model": "qwen-turbo"
-    },
-    "8": {
-        "name": "HuggingFace",
-        "env_key": "HUGGINGFACE_API_KEY",
-        "api_url": "https://api-inference.huggingface.co/models/",
-        "model": "mistralai/Mistral-7B-Instruct-v0.2"
-    }
-}
+from utils.ui import CONSOLE
+
+@dataclass(frozen=True, slots=True)
+class Provider:
+    """Static configuration for one supported LLM provider
+
+    provider_tag picks the request/response format family in
+    UniversalLLMClient; model_key is the env var holding the saved
+    model name, derived from env_key once at construction.
+    """
+    id: str
+    name: str
+    env_key: str
+    provider_tag: str
+    api_url: str
+    model: str
+    model_key: str = ""
+
+    def __post_init__(self):
+        if not self.model_key:
+            object.__setattr__(
+                self, 'model_key', self.env_key.replace('_API_KEY', '_MODEL')
+            )
+
+# Supported LLM providers; frozen and slotted so instances are compact
+# and can't drift at runtime
+LLM_PROVIDERS = (
+    Provider(
+        id="1",
+        name="Google (Gemini)",
+        env_key="GOOGLE_API_KEY",
+        provider_tag="google",
+        api_url="https://generativelanguage.googleapis.com/v1beta/models/",
+        model="gemini-2.5-pro"
+    ),
+    Provider(
+        id="2",
+        name="OpenRouter",
+        env_key="OPENROUTER_API_KEY",
+        provider_tag="openrouter",
+        api_url="https://openrouter.ai/api/v1/chat/completions",
+        model="openai/gpt-oss-20b:free"
+    ),
+    Provider(
+        id="3",
+        name="OpenAI",
+        env_key="OPENAI_API_KEY",
+        provider_tag="openai",
+        api_url="https://api.openai.com/v1/chat/completions",
+        model="gpt-3.5-turbo"
+    ),
+    Provider(
+        id="4",
+        name="Anthropic (Claude)",
+        env_key="ANTHROPIC_API_KEY",
+        provider_tag="anthropic",
+        api_url="https://api.anthropic.com/v1/messages",
+        model="claude-3-sonnet-20240229"
+    ),
+    Provider(
+        id="5",
+        name="xAI (Grok)",
+        env_key="XAI_API_KEY",
+        provider_tag="openai",
+        api_url="https://api.x.ai/v1/chat/completions",
+        model="grok-beta"
+    ),
+    Provider(
+        id="6",
+        name="DeepSeek",
+        env_key="DEEPSEEK_API_KEY",
+        provider_tag="openai",
+        api_url="https://api.deepseek.com/v1/chat/completions",
+        model="deepseek-chat"
+    ),
+    Provider(
+        id="7",
+        name="Qwen",
+        env_key="QWEN_API_KEY",
+        provider_tag="openai",
+        api_url="https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation",
+        model="qwen-turbo"
+    ),
+    Provider(
+        id="8",
+        name="HuggingFace",
+        env_key="HUGGINGFACE_API_KEY",
+        provider_tag="huggingface",
+        api_url="https://api-inference.huggingface.co/models/",
+        model="mistralai/Mistral-7B-Instruct-v0.2"
+    ),
+)
+
+# Id lookup for menu selections
+PROVIDERS_BY_ID = {provider.id: provider for provider in LLM_PROVIDERS}
+
+# The provider menu never changes at runtime, so pre-render its rows once
+_PROVIDER_ROWS = [(provider.id, provider.name) for provider in LLM_PROVIDERS]
+
+# Fully built provider panels, keyed by whether the cancel row is shown
+_PROVIDER_PANELS = {}
 
 # Custom replies to save tokens
-CUSTOM_REPLIES = {
+_RAW_CUSTOM_REPLIES = {
     'hello': 'Hello! Main aapki madad ke liye taiyaar hu. Kya main aapki koi madad kar sakta hu?',
     'hi': 'Hi! Kaise madad kar sakta hu?',
     'hey': 'Hey there! Kya help chahiye?',
@@ -84,6 +136,75 @@ Ask me anything!''',
     'okay': 'Bilkul! Aur kya help chahiye?',
 }
 
+# Frozen, pre-normalized view so lookups never mutate or re-normalize keys
+CUSTOM_REPLIES = MappingProxyType(
+    {key.lower().strip(): value for key, value in _RAW_CUSTOM_REPLIES.items()}
+)
+
+# Inputs longer than the longest key can never match a custom reply
+CUSTOM_REPLY_MAX_LEN = max(map(len, CUSTOM_REPLIES))
+
+# Last-seen mtime per .env path, so repeated EnvManager constructions
+# don't re-read and re-parse an unchanged file
+_DOTENV_MTIMES = {}
+
+def _load_dotenv_once(path: str) -> None:
+    """
+    Load a .env file only if it changed since the last load
+
+    Args:
+        path: Path to the .env file
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return
+
+    if _DOTENV_MTIMES.get(path) != mtime:
+        load_dotenv(path)
+        _DOTENV_MTIMES[path] = mtime
+
+def _format_env_line(key: str, value: str) -> str:
+    """
+    Format one .env line the way python-dotenv's set_key writes it
+
+    Backslashes and single quotes in the value are escaped so keys
+    containing them survive the next load intact.
+
+    Args:
+        key: The env variable name
+        value: The value to store
+
+    Returns:
+        A single newline-terminated KEY='value' line
+    """
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"{key}='{escaped}'\n"
+
+@lru_cache(maxsize=1)
+def _build_active_provider(active_id: str, api_key: str,
+                           saved_model: Optional[str]) -> Dict[str, str]:
+    """
+    Flatten the active provider to the plain dict the client consumes
+
+    Memoized on the env values it depends on, so repeated
+    get_active_provider calls (startup banner, client init, reloads)
+    only rebuild the dict when the configuration actually changed.
+
+    Args:
+        active_id: Provider id from ACTIVE_PROVIDER
+        api_key: The provider's API key
+        saved_model: Saved model name, or None for the default
+
+    Returns:
+        Provider configuration dict
+    """
+    config = asdict(PROVIDERS_BY_ID[active_id])
+    config['api_key'] = api_key
+    if saved_model:
+        config['model'] = saved_model
+    return config
+
 class EnvManager:
     """Manage environment variables and API keys"""
     
@@ -95,11 +216,64 @@ class EnvManager:
             env_path: Path to the .env file
         """
         self.env_path = env_path
-        self.console = Console()
-        
-        # Load existing environment
-        if os.path.exists(self.env_path):
-            load_dotenv(self.env_path)
+        self.console = CONSOLE
+
+        # Load existing environment (no-op if the file hasn't changed)
+        _load_dotenv_once(self.env_path)
+
+        # Snapshot of the environment so hot menu paths read a plain dict
+        # instead of hitting os.environ repeatedly; kept in sync on writes
+        self._env_snapshot = dict(os.environ)
+
+    def _set_key(self, key: str, value: str) -> None:
+        """set_key wrapper that keeps the env snapshot in sync"""
+        set_key(self.env_path, key, value)
+        self._env_snapshot[key] = value
+
+    def _unset_key(self, key: str) -> None:
+        """unset_key wrapper that keeps the env snapshot in sync"""
+        unset_key(self.env_path, key)
+        self._env_snapshot.pop(key, None)
+
+    def _bulk_set_keys(self, updates: Dict[str, str]) -> None:
+        """
+        Apply several key updates with one read and one atomic write
+
+        Unlike repeated set_key calls (each a full read + rewrite + sync),
+        this loads the file once, applies every update in memory, and
+        swaps the result into place with os.replace so a crash can never
+        leave a half-written .env.
+
+        Args:
+            updates: Mapping of env keys to their new values
+        """
+        try:
+            with open(self.env_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+
+        remaining = dict(updates)
+        for i, line in enumerate(lines):
+            key = line.split("=", 1)[0].strip()
+            if key in remaining:
+                lines[i] = _format_env_line(key, remaining.pop(key))
+
+        # A hand-edited file may lack a trailing newline; appending onto
+        # such a line would merge two entries into one unparseable line
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+
+        # Keys not already present are appended (same format as set_key)
+        for key, value in remaining.items():
+            lines.append(_format_env_line(key, value))
+
+        tmp_path = self.env_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.env_path)
+
+        self._env_snapshot.update(updates)
     
     def setup_first_run(self) -> bool:
         """
@@ -121,7 +295,7 @@ class EnvManager:
         self._display_providers(show_cancel=True)
         
         # Get user selection with cancel option
-        choices = list(LLM_PROVIDERS.keys()) + ['0']
+        choices = list(PROVIDERS_BY_ID) + ['0']
         choice = Prompt.ask(
             "\n[bold green]Apna LLM provider chunen (0 - Cancel)[/bold green]",
             choices=choices
@@ -132,10 +306,10 @@ class EnvManager:
             self.console.print("[yellow]Setup cancel ho gaya. Aap baad mein setup kar sakte hain.[/yellow]")
             return False
         
-        provider = LLM_PROVIDERS[choice]
+        provider = PROVIDERS_BY_ID[choice]
         
         # Get API key with masked input
-        self.console.print(f"\n[bold yellow]{provider['name']} ka API key dalen[/bold yellow]")
+        self.console.print(f"\n[bold yellow]{provider.name} ka API key dalen[/bold yellow]")
         self.console.print("[dim]Note: API key stars (***) ke roop mein dikhega[/dim]")
         self.console.print("[dim]Cancel karne ke liye khali chhod kar Enter dabaye[/dim]\n")
         
@@ -145,49 +319,40 @@ class EnvManager:
             self.console.print("[yellow]API key nahi dala gaya. Setup cancel ho gaya.[/yellow]")
             return False
         
-        # Show masked API key for confirmation
-        masked_key = '*' * len(api_key)
-        self.console.print(f"[green]✓ API key received: {masked_key}[/green]")
+        # Show a fixed-length mask so even the key's length isn't disclosed
+        self.console.print("[green]✓ API key received: ********[/green]")
         
         # Get model name with cancel option
         self.console.print(
-            f"\n[dim]Default model: {provider['model']}[/dim]"
+            f"\n[dim]Default model: {provider.model}[/dim]"
         )
         self.console.print("[dim]Khali chhod kar Enter dabane par default model use hoga[/dim]")
         self.console.print("[dim]'cancel' likhkar cancel kar sakte hain[/dim]\n")
         
         model_name = Prompt.ask(
             f"[bold yellow]Model name dalen[/bold yellow]",
-            default=provider['model']
+            default=provider.model
         )
         
         if model_name.lower() == 'cancel':
             self.console.print("[yellow]Setup cancel ho gaya.[/yellow]")
             return False
         
-        # Create .env file and save API key
+        # Save API key (the .env file is created on first write)
         try:
-            # Create .env file if it doesn't exist
-            if not os.path.exists(self.env_path):
-                open(self.env_path, 'w').close()
-            
-            # Save API key
-            set_key(self.env_path, provider['env_key'], api_key)
-            
-            # Save model name
-            model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-            set_key(self.env_path, model_key, model_name)
-            
-            # Save active provider
-            set_key(self.env_path, "ACTIVE_PROVIDER", choice)
-            
-            # Save provider name
-            set_key(self.env_path, "ACTIVE_PROVIDER_NAME", provider['name'])
+            # Save the key, model and active-provider settings in one
+            # atomic write
+            self._bulk_set_keys({
+                provider.env_key: api_key,
+                provider.model_key: model_name,
+                "ACTIVE_PROVIDER": choice,
+                "ACTIVE_PROVIDER_NAME": provider.name,
+            })
             
             self.console.print(
                 Panel(
                     f"[bold green]✓[/bold green] API key successfully save ho gaya!\n"
-                    f"[white]Active Provider:[/white] [bold cyan]{provider['name']}[/bold cyan]\n"
+                    f"[white]Active Provider:[/white] [bold cyan]{provider.name}[/bold cyan]\n"
                     f"[white]Model:[/white] [bold cyan]{model_name}[/bold cyan]",
                     border_style="green",
                     title="Success"
@@ -218,7 +383,7 @@ class EnvManager:
         self._display_providers(show_cancel=True)
         
         # Get user selection with cancel option
-        choices = list(LLM_PROVIDERS.keys()) + ['0']
+        choices = list(PROVIDERS_BY_ID) + ['0']
         choice = Prompt.ask(
             "\n[bold green]Provider chunen (0 - Cancel)[/bold green]",
             choices=choices
@@ -229,20 +394,20 @@ class EnvManager:
             self.console.print("[yellow]Operation cancel ho gaya.[/yellow]")
             return
         
-        provider = LLM_PROVIDERS[choice]
+        provider = PROVIDERS_BY_ID[choice]
         
         # Check if API key already exists
-        existing_key = os.getenv(provider['env_key'])
+        existing_key = self._env_snapshot.get(provider.env_key)
         if existing_key:
             overwrite = Confirm.ask(
-                f"\n[yellow]{provider['name']} ka API key pehle se saved hai. Kya overwrite karein?[/yellow]"
+                f"\n[yellow]{provider.name} ka API key pehle se saved hai. Kya overwrite karein?[/yellow]"
             )
             if not overwrite:
                 self.console.print("[yellow]Operation cancel ho gaya.[/yellow]")
                 return
         
         # Get API key with masked input
-        self.console.print(f"\n[bold yellow]{provider['name']} ka API key dalen[/bold yellow]")
+        self.console.print(f"\n[bold yellow]{provider.name} ka API key dalen[/bold yellow]")
         self.console.print("[dim]Note: API key stars (***) ke roop mein dikhega[/dim]")
         self.console.print("[dim]Cancel karne ke liye khali chhod kar Enter dabaye[/dim]\n")
         
@@ -252,20 +417,19 @@ class EnvManager:
             self.console.print("[yellow]API key nahi dala gaya. Operation cancel ho gaya.[/yellow]")
             return
         
-        # Show masked API key for confirmation
-        masked_key = '*' * len(api_key)
-        self.console.print(f"[green]✓ API key received: {masked_key}[/green]")
+        # Show a fixed-length mask so even the key's length isn't disclosed
+        self.console.print("[green]✓ API key received: ********[/green]")
         
         # Get model name with cancel option
         self.console.print(
-            f"\n[dim]Default model: {provider['model']}[/dim]"
+            f"\n[dim]Default model: {provider.model}[/dim]"
         )
         self.console.print("[dim]Khali chhod kar Enter dabane par default model use hoga[/dim]")
         self.console.print("[dim]'cancel' likhkar cancel kar sakte hain[/dim]\n"
         )
         model_name = Prompt.ask(
             f"[bold yellow]Model name dalen[/bold yellow]",
-            default=provider['model']
+            default=provider.model
         )
         
         if model_name.lower() == 'cancel':
@@ -273,16 +437,15 @@ class EnvManager:
             return
         
         try:
-            # Save API key
-            set_key(self.env_path, provider['env_key'], api_key)
-            
-            # Save model name
-            model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-            set_key(self.env_path, model_key, model_name)
+            # Save the key and model name in one atomic write
+            self._bulk_set_keys({
+                provider.env_key: api_key,
+                provider.model_key: model_name,
+            })
             
             self.console.print(
                 Panel(
-                    f"[bold green]✓[/bold green] {provider['name']} ka API key successfully save ho gaya!\n"
+                    f"[bold green]✓[/bold green] {provider.name} ka API key successfully save ho gaya!\n"
                     f"[white]Model:[/white] [bold cyan]{model_name}[/bold cyan]",
                     border_style="green"
                 )
@@ -290,14 +453,16 @@ class EnvManager:
             
             # Ask if they want to switch to this provider
             switch = Confirm.ask(
-                f"\n[cyan]Kya aap {provider['name']} ko active provider banana chahte hain?[/cyan]"
+                f"\n[cyan]Kya aap {provider.name} ko active provider banana chahte hain?[/cyan]"
             )
             
             if switch:
-                set_key(self.env_path, "ACTIVE_PROVIDER", choice)
-                set_key(self.env_path, "ACTIVE_PROVIDER_NAME", provider['name'])
+                self._bulk_set_keys({
+                    "ACTIVE_PROVIDER": choice,
+                    "ACTIVE_PROVIDER_NAME": provider.name,
+                })
                 self.console.print(
-                    f"[bold green]✓[/bold green] Active provider change ho gaya: [bold cyan]{provider['name']}[/bold cyan] ({model_name})"
+                    f"[bold green]✓[/bold green] Active provider change ho gaya: [bold cyan]{provider.name}[/bold cyan] ({model_name})"
                 )
                 
         except Exception as e:
@@ -331,26 +496,8 @@ class EnvManager:
             return
         
         # Display saved providers with models
-        table = Table(title="Saved API Keys", box=None)
-        table.add_column("Number", style="bold cyan")
-        table.add_column("Provider", style="bold")
-        table.add_column("Model", style="dim")
-        table.add_column("Status", style="bold")
-        
-        active_provider = os.getenv("ACTIVE_PROVIDER")
-        
-        for idx, provider_id in saved_providers.items():
-            provider = LLM_PROVIDERS[provider_id]
-            model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-            model_name = os.getenv(model_key, provider['model'])
-            status = "[green]✓ Active[/green]" if provider_id == active_provider else ""
-            table.add_row(idx, provider['name'], model_name, status)
-        
-        # Add cancel option
-        table.add_row("0", "[yellow]Cancel[/yellow]", "", "")
-        
-        self.console.print(Panel(table, border_style="blue"))
-        
+        self._display_saved_providers(saved_providers)
+
         # Get user selection with cancel option
         choices = list(saved_providers.keys()) + ['0']
         choice = Prompt.ask(
@@ -364,18 +511,20 @@ class EnvManager:
             return
         
         provider_id = saved_providers[choice]
-        provider = LLM_PROVIDERS[provider_id]
-        model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-        model_name = os.getenv(model_key, provider['model'])
+        provider = PROVIDERS_BY_ID[provider_id]
+        model_key = provider.model_key
+        model_name = self._env_snapshot.get(model_key, provider.model)
         
         try:
-            set_key(self.env_path, "ACTIVE_PROVIDER", provider_id)
-            set_key(self.env_path, "ACTIVE_PROVIDER_NAME", provider['name'])
+            self._bulk_set_keys({
+                "ACTIVE_PROVIDER": provider_id,
+                "ACTIVE_PROVIDER_NAME": provider.name,
+            })
             
             self.console.print(
                 Panel(
                     f"[bold green]✓[/bold green] Active provider successfully change ho gaya!\n"
-                    f"[white]Naya Active Provider:[/white] [bold cyan]{provider['name']}[/bold cyan]\n"
+                    f"[white]Naya Active Provider:[/white] [bold cyan]{provider.name}[/bold cyan]\n"
                     f"[white]Model:[/white] [bold cyan]{model_name}[/bold cyan]",
                     border_style="green"
                 )
@@ -411,26 +560,10 @@ class EnvManager:
             return
         
         # Display saved providers with models
-        table = Table(title="Saved API Keys", box=None)
-        table.add_column("Number", style="bold cyan")
-        table.add_column("Provider", style="bold")
-        table.add_column("Model", style="dim")
-        table.add_column("Status", style="bold")
-        
-        active_provider = os.getenv("ACTIVE_PROVIDER")
-        
-        for idx, provider_id in saved_providers.items():
-            provider = LLM_PROVIDERS[provider_id]
-            model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-            model_name = os.getenv(model_key, provider['model'])
-            status = "[green]✓ Active[/green]" if provider_id == active_provider else ""
-            table.add_row(idx, provider['name'], model_name, status)
-        
-        # Add cancel option
-        table.add_row("0", "[yellow]Cancel[/yellow]", "", "")
-        
-        self.console.print(Panel(table, border_style="blue"))
-        
+        self._display_saved_providers(saved_providers)
+
+        active_provider = self._env_snapshot.get("ACTIVE_PROVIDER")
+
         # Get user selection with cancel option
         choices = list(saved_providers.keys()) + ['0']
         choice = Prompt.ask(
@@ -444,11 +577,11 @@ class EnvManager:
             return
         
         provider_id = saved_providers[choice]
-        provider = LLM_PROVIDERS[provider_id]
+        provider = PROVIDERS_BY_ID[provider_id]
         
         # Confirm deletion
         confirm = Confirm.ask(
-            f"\n[bold red]Kya aap {provider['name']} ka API key delete karna chahte hain?[/bold red]"
+            f"\n[bold red]Kya aap {provider.name} ka API key delete karna chahte hain?[/bold red]"
         )
         
         if not confirm:
@@ -457,20 +590,20 @@ class EnvManager:
         
         try:
             # Delete API key
-            unset_key(self.env_path, provider['env_key'])
+            self._unset_key(provider.env_key)
             
             # Delete model name
-            model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-            unset_key(self.env_path, model_key)
+            model_key = provider.model_key
+            self._unset_key(model_key)
             
             # If this was the active provider, clear it
             if provider_id == active_provider:
-                unset_key(self.env_path, "ACTIVE_PROVIDER")
-                unset_key(self.env_path, "ACTIVE_PROVIDER_NAME")
+                self._unset_key("ACTIVE_PROVIDER")
+                self._unset_key("ACTIVE_PROVIDER_NAME")
                 
                 self.console.print(
                     Panel(
-                        f"[bold green]✓[/bold green] {provider['name']} ka API key delete ho gaya!\n"
+                        f"[bold green]✓[/bold green] {provider.name} ka API key delete ho gaya!\n"
                         f"[yellow]Note:[/yellow] Koi active provider nahi hai. Kripya /switch command use karein.",
                         border_style="green"
                     )
@@ -478,7 +611,7 @@ class EnvManager:
             else:
                 self.console.print(
                     Panel(
-                        f"[bold green]✓[/bold green] {provider['name']} ka API key delete ho gaya!",
+                        f"[bold green]✓[/bold green] {provider.name} ka API key delete ho gaya!",
                         border_style="green"
                     )
                 )
@@ -498,20 +631,18 @@ class EnvManager:
         Returns:
             Provider configuration dict or None if not set
         """
-        active_id = os.getenv("ACTIVE_PROVIDER")
-        if not active_id or active_id not in LLM_PROVIDERS:
+        active_id = self._env_snapshot.get("ACTIVE_PROVIDER")
+        provider = PROVIDERS_BY_ID.get(active_id) if active_id else None
+        if provider is None:
             return None
-        
-        provider = LLM_PROVIDERS[active_id].copy()
-        provider['api_key'] = os.getenv(provider['env_key'])
-        
-        # Get the saved model name or use default
-        model_key = provider['env_key'].replace('_API_KEY', '_MODEL')
-        saved_model = os.getenv(model_key)
-        if saved_model:
-            provider['model'] = saved_model
-        
-        return provider if provider['api_key'] else None
+
+        api_key = self._env_snapshot.get(provider.env_key)
+        if not api_key:
+            return None
+
+        return _build_active_provider(
+            active_id, api_key, self._env_snapshot.get(provider.model_key)
+        )
     
     def _display_providers(self, show_cancel: bool = False) -> None:
         """
@@ -520,18 +651,53 @@ class EnvManager:
         Args:
             show_cancel: Whether to show cancel option
         """
-        table = Table(title="Available LLM Providers", box=None)
+        panel = _PROVIDER_PANELS.get(show_cancel)
+
+        if panel is None:
+            table = Table(title="Available LLM Providers", box=None)
+            table.add_column("Number", style="bold cyan")
+            table.add_column("Provider", style="bold")
+
+            for key, name in _PROVIDER_ROWS:
+                table.add_row(key, name)
+
+            if show_cancel:
+                table.add_row("0", "[yellow]Cancel / Skip[/yellow]")
+
+            panel = Panel(table, border_style="blue")
+            _PROVIDER_PANELS[show_cancel] = panel
+
+        self.console.print(panel)
+
+    def _display_saved_providers(self, saved_providers: Dict[str, str]) -> None:
+        """
+        Display the saved providers with their models and active status
+
+        Args:
+            saved_providers: Dict mapping display number to provider ID
+        """
+        table = Table(title="Saved API Keys", box=None)
         table.add_column("Number", style="bold cyan")
         table.add_column("Provider", style="bold")
-        
-        for key, provider in LLM_PROVIDERS.items():
-            table.add_row(key, provider['name'])
-        
-        if show_cancel:
-            table.add_row("0", "[yellow]Cancel / Skip[/yellow]")
-        
+        table.add_column("Model", style="dim")
+        table.add_column("Status", style="bold")
+
+        snapshot = self._env_snapshot
+        active_provider = snapshot.get("ACTIVE_PROVIDER")
+
+        # Single pass over the snapshot: saved model and active marker
+        # come from the same cached dict
+        for idx, provider_id in saved_providers.items():
+            provider = PROVIDERS_BY_ID[provider_id]
+            model_name = snapshot.get(provider.model_key, provider.model)
+            status = "[green]✓ Active[/green]" if provider_id == active_provider else ""
+            table.add_row(idx, provider.name, model_name, status)
+
+        # Add cancel option
+        table.add_row("0", "[yellow]Cancel[/yellow]", "", "")
+
         self.console.print(Panel(table, border_style="blue"))
-    
+
     def _get_saved_providers(self) -> Dict[str, str]:
         """
         Get list of providers with saved API keys
@@ -539,15 +705,14 @@ class EnvManager:
         Returns:
             Dict mapping display number to provider ID
         """
-        saved = {}
-        idx = 1
-        
-        for provider_id, provider in LLM_PROVIDERS.items():
-            if os.getenv(provider['env_key']):
-                saved[str(idx)] = provider_id
-                idx += 1
-        
-        return saved
+        snapshot = self._env_snapshot
+        return {
+            str(idx): provider_id
+            for idx, provider_id in enumerate(
+                (p.id for p in LLM_PROVIDERS if snapshot.get(p.env_key)),
+                start=1
+            )
+        }
     
     def check_env_exists(self) -> bool:
         """Check if .env file exists with required configuration"""
@@ -555,7 +720,8 @@ class EnvManager:
             return False
         
         # Check if at least one API key is configured
-        load_dotenv(self.env_path)
+        _load_dotenv_once(self.env_path)
+        self._env_snapshot = dict(os.environ)
         active_provider = self.get_active_provider()
         
         return active_provider is not None
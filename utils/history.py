@@ -0,0 +1,83 @@
+"""
+Bounded chat history for TermChat
+Keeps the prompt sent to the LLM under a fixed token budget
+"""
+from collections import deque
+from typing import Dict, Iterator
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a piece of text
+
+    Uses the common ~4 characters per token heuristic, which is close
+    enough for budgeting without pulling in a tokenizer dependency.
+
+    Args:
+        text: The text to estimate
+
+    Returns:
+        Estimated number of tokens
+    """
+    return len(text) // 4 + 1
+
+
+class ChatHistory:
+    """List-like message history that evicts old turns over a token budget"""
+
+    def __init__(self, max_tokens: int = 6000):
+        """
+        Initialize the chat history
+
+        Args:
+            max_tokens: Estimated token budget for the messages kept
+        """
+        self.max_tokens = max_tokens
+        self._messages = deque()
+        self._tokens = 0
+
+    def append(self, message: Dict[str, str]) -> None:
+        """
+        Add a message and evict the oldest turns if over budget
+
+        Args:
+            message: Message dict with role and content
+        """
+        self._messages.append(message)
+        self._tokens += estimate_tokens(message["content"])
+        self._prune()
+
+    def _prune(self) -> None:
+        """Drop oldest non-system messages until under the token budget"""
+        while self._tokens > self.max_tokens and len(self._messages) > 1:
+            # Preserve a leading system message and the newest message
+            index = 1 if self._messages[0]["role"] == "system" else 0
+            if index >= len(self._messages) - 1:
+                break
+            evicted = self._messages[index]
+            del self._messages[index]
+            self._tokens -= estimate_tokens(evicted["content"])
+
+    def pop(self) -> Dict[str, str]:
+        """Remove and return the most recent message"""
+        message = self._messages.pop()
+        self._tokens -= estimate_tokens(message["content"])
+        return message
+
+    def clear(self) -> None:
+        """Drop all messages"""
+        self._messages.clear()
+        self._tokens = 0
+
+    def to_list(self):
+        """Return the messages as a plain list for API payloads"""
+        return list(self._messages)
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        return self._messages[index]
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self._messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
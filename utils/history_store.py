@@ -0,0 +1,97 @@
+"""
+Disk-backed chat history log for TermChat
+Persists sessions to SQLite so a crash doesn't lose the conversation
+"""
+import os
+import sqlite3
+import time
+import uuid
+from typing import Dict, Iterable, List
+
+# Per-user database under ~/.termchat
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".termchat", "history.db")
+
+
+class HistoryStore:
+    """Append-only SQLite log of chat messages, one row per message"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Initialize the history store
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.session_id = uuid.uuid4().hex
+        self._conn = sqlite3.connect(db_path)
+
+        # WAL keeps appends cheap and readers unblocked; NORMAL sync is
+        # plenty for a chat log
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "session_id TEXT NOT NULL, "
+            "ts REAL NOT NULL, "
+            "role TEXT NOT NULL, "
+            "content TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_session "
+            "ON messages(session_id, ts)"
+        )
+        self._conn.commit()
+
+    def append_turn(self, messages: Iterable[Dict[str, str]]) -> None:
+        """
+        Record the messages of one turn in a single transaction
+
+        Args:
+            messages: Message dicts with role and content
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, ts, role, content) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.session_id, now, m["role"], m["content"]) for m in messages]
+            )
+
+    def last_session(self) -> List[Dict[str, str]]:
+        """
+        Get the messages of the most recent previous session
+
+        Returns:
+            Message dicts in chronological order, or an empty list
+        """
+        row = self._conn.execute(
+            "SELECT session_id FROM messages WHERE session_id != ? "
+            "ORDER BY ts DESC LIMIT 1",
+            (self.session_id,)
+        ).fetchone()
+
+        if not row:
+            return []
+
+        rows = self._conn.execute(
+            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY ts",
+            (row[0],)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+
+# Shared store instance so the chat loop and /resume see the same session
+_STORE = None
+
+def get_store() -> HistoryStore:
+    """Get the process-wide HistoryStore, creating it on first use"""
+    global _STORE
+    if _STORE is None:
+        _STORE = HistoryStore()
+    return _STORE
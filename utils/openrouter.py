@@ -2,8 +2,31 @@
 Universal LLM API client module for TermChat
 Supports multiple LLM providers
 """
+import atexit
+import json
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Iterator
+
+# Connect fast-fails in ~3s; reads get a minute (long generations can
+# legitimately stall between SSE chunks)
+_TIMEOUT = (3.05, 60)
+
+# orjson is optional but 2-5x faster on the per-turn payloads; fall back
+# to the stdlib with the same bytes-in/bytes-out contract
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
 
 class UniversalLLMClient:
     """Universal client for interacting with multiple LLM providers"""
@@ -24,58 +47,190 @@ class UniversalLLMClient:
         self.api_key = provider_config['api_key']
         self.base_url = provider_config['api_url']
         self.model = provider_config['model']
-        
+
+        # Normalized tag that keys the dispatch tables below; unknown
+        # configs default to the OpenAI-compatible format
+        self.tag = provider_config.get('provider_tag', 'openai')
+
         # Setup headers based on provider
         self._setup_headers()
+
+        # Gemini routes the model and key through the URL; build it once
+        if self.tag == "google":
+            self._google_url = self._build_google_url()
+
+        # HuggingFace appends the model to the base URL; build it once
+        if self.tag == "huggingface":
+            self._huggingface_url = f"{self.base_url}{self.model}"
+
+        # Persistent session so follow-up requests reuse the TCP+TLS
+        # connection instead of paying a fresh handshake every turn
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+        # One provider host; cap the pool so we don't hold idle sockets.
+        # Transient failures (rate limits, gateway hiccups) are retried
+        # with exponential backoff; Retry-After headers are honored.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        atexit.register(self.session.close)
+
+    def __enter__(self) -> "UniversalLLMClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.session.close()
     
+    def _build_google_url(self) -> str:
+        """Build the Gemini generateContent endpoint URL"""
+        return (
+            "https://generativelanguage.googleapis.com/v1beta/models/"
+            f"{self.model}:generateContent?key={self.api_key}"
+        )
+
+    def _openrouter_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/termchat",
+            "X-Title": "TermChat"
+        }
+
+    def _anthropic_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+
+    def _default_headers(self) -> Dict[str, str]:
+        # Default header format (OpenAI, xAI, DeepSeek, etc.)
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
     def _setup_headers(self) -> None:
-        """Setup HTTP headers based on the provider"""
-        if "OpenRouter" in self.provider_name:
-            self.headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/termchat",
-                "X-Title": "TermChat"
-            }
-        elif "Anthropic" in self.provider_name:
-            self.headers = {
-                "x-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01"
-            }
-        elif "HuggingFace" in self.provider_name:
-            self.headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-        else:
-            # Default header format (OpenAI, xAI, DeepSeek, etc.)
-            self.headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-    
+        """Setup HTTP headers based on the provider tag"""
+        builder = self._HEADER_BUILDERS.get(self.tag, UniversalLLMClient._default_headers)
+        self.headers = builder(self)
+
     def get_response(self, messages: List[Dict[str, str]]) -> str:
         """
         Get a response from the AI
-        
+
         Args:
             messages: List of message objects with role and content
-            
+
         Returns:
             The AI's response text
         """
-        # Format request based on provider
-        if "Anthropic" in self.provider_name:
-            return self._get_anthropic_response(messages)
-        elif "Google" in self.provider_name:
-            return self._get_google_response(messages)
-        elif "HuggingFace" in self.provider_name:
-            return self._get_huggingface_response(messages)
+        handler = self._HANDLERS.get(self.tag, UniversalLLMClient._get_openai_compatible_response)
+        return handler(self, messages)
+
+    def stream_response(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Stream a response from the AI, yielding text chunks as they arrive
+
+        Args:
+            messages: List of message objects with role and content
+
+        Yields:
+            Chunks of the AI's response text
+        """
+        handler = self._STREAM_HANDLERS.get(self.tag)
+        if handler is None:
+            yield from self._stream_openai_compatible_response(messages)
         else:
-            # Default OpenAI-compatible format
-            return self._get_openai_compatible_response(messages)
-    
+            yield from handler(self, messages)
+
+    def _stream_full_response(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Fallback for providers without SSE support: one full chunk"""
+        yield self.get_response(messages)
+
+    def _stream_openai_compatible_response(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream response chunks from OpenAI-compatible APIs via SSE"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True
+        }
+
+        response = self.session.post(
+            self.base_url,
+            data=_dumps(payload),
+            stream=True,
+            timeout=_TIMEOUT
+        )
+
+        response.raise_for_status()
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+
+            line = line.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+
+            try:
+                chunk = _loads(data)
+            except ValueError:
+                continue
+
+            delta = chunk["choices"][0].get("delta", {})
+            content = delta.get("content")
+            if content:
+                yield content
+
+    def _stream_anthropic_response(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream response chunks from the Anthropic Claude API via SSE"""
+        payload = self._anthropic_payload(messages, stream=True)
+
+        response = self.session.post(
+            self.base_url,
+            data=_dumps(payload),
+            stream=True,
+            timeout=_TIMEOUT
+        )
+
+        response.raise_for_status()
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+
+            line = line.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+
+            try:
+                event = _loads(line[len("data: "):])
+            except ValueError:
+                continue
+
+            # Text arrives as content_block_delta events; message_stop ends
+            # the stream
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+            elif event_type == "message_stop":
+                break
+
     def _get_openai_compatible_response(self, messages: List[Dict[str, str]]) -> str:
         """Get response from OpenAI-compatible APIs"""
         payload = {
@@ -83,78 +238,80 @@ class UniversalLLMClient:
             "messages": messages
         }
         
-        response = requests.post(
+        response = self.session.post(
             self.base_url,
-            headers=self.headers,
-            json=payload
+            data=_dumps(payload),
+            timeout=_TIMEOUT
         )
-        
+
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         return data["choices"][0]["message"]["content"]
     
-    def _get_anthropic_response(self, messages: List[Dict[str, str]]) -> str:
-        """Get response from Anthropic Claude API"""
-        # Convert messages to Anthropic format
+    def _anthropic_payload(self, messages: List[Dict[str, str]],
+                           stream: bool = False) -> Dict[str, Any]:
+        """Build an Anthropic Messages payload in a single pass"""
         system_message = ""
         user_messages = []
-        
+        append = user_messages.append
+
         for msg in messages:
             if msg["role"] == "system":
                 system_message = msg["content"]
             else:
-                user_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-        
+                append({"role": msg["role"], "content": msg["content"]})
+
         payload = {
             "model": self.model,
             "messages": user_messages,
             "max_tokens": 4096
         }
-        
+
+        if stream:
+            payload["stream"] = True
         if system_message:
             payload["system"] = system_message
-        
-        response = requests.post(
+
+        return payload
+
+    def _get_anthropic_response(self, messages: List[Dict[str, str]]) -> str:
+        """Get response from Anthropic Claude API"""
+        payload = self._anthropic_payload(messages)
+
+        response = self.session.post(
             self.base_url,
-            headers=self.headers,
-            json=payload
+            data=_dumps(payload),
+            timeout=_TIMEOUT
         )
-        
+
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         return data["content"][0]["text"]
     
     def _get_google_response(self, messages: List[Dict[str, str]]) -> str:
         """Get response from Google Gemini API"""
-        # Convert messages to Google Gemini format
-        # Gemini expects alternating user/model roles
-        contents = []
-        for msg in messages:
-            # Convert 'assistant' role to 'model' for Gemini
-            role = "user" if msg["role"] == "user" else "model"
-            contents.append({
-                "role": role,
-                "parts": [{"text": msg["content"]}]
-            })
-        
-        # Correct Gemini API endpoint format
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent?key={self.api_key}"
-        
+        # Convert messages to Google Gemini format in one comprehension;
+        # Gemini expects alternating user/model roles ('assistant' -> 'model')
+        contents = [
+            {"role": "user" if m["role"] == "user" else "model",
+             "parts": [{"text": m["content"]}]}
+            for m in messages
+        ]
+
         payload = {
             "contents": contents
         }
-        
-        response = requests.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            json=payload
+
+        # The key travels in the URL; drop the session's auth header
+        response = self.session.post(
+            self._google_url,
+            headers={"Authorization": None},
+            data=_dumps(payload),
+            timeout=_TIMEOUT
         )
-        
+
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         
         # Extract response with error handling
         try:
@@ -167,11 +324,10 @@ class UniversalLLMClient:
     
     def _get_huggingface_response(self, messages: List[Dict[str, str]]) -> str:
         """Get response from HuggingFace API"""
-        # Combine messages into a single prompt
-        prompt = "\n".join([f"{msg['role']}: {msg['content']}" for msg in messages])
-        
-        url = f"{self.base_url}{self.model}"
-        
+        # Combine messages into a single prompt; the generator feeds
+        # join without materializing an intermediate list
+        prompt = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+
         payload = {
             "inputs": prompt,
             "parameters": {
@@ -180,14 +336,14 @@ class UniversalLLMClient:
             }
         }
         
-        response = requests.post(
-            url,
-            headers=self.headers,
-            json=payload
+        response = self.session.post(
+            self._huggingface_url,
+            data=_dumps(payload),
+            timeout=_TIMEOUT
         )
-        
+
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         
         # HuggingFace returns different formats
         if isinstance(data, list) and len(data) > 0:
@@ -199,8 +355,34 @@ class UniversalLLMClient:
     def set_model(self, model: str) -> None:
         """
         Change the AI model
-        
+
         Args:
             model: The model identifier to use
         """
-        self.model = model
\ No newline at end of file
+        self.model = model
+
+        # The Gemini and HuggingFace endpoints embed the model, so
+        # rebuild them
+        if self.tag == "google":
+            self._google_url = self._build_google_url()
+        elif self.tag == "huggingface":
+            self._huggingface_url = f"{self.base_url}{self.model}"
+
+    # Dispatch tables keyed on provider tag; missing tags fall back to the
+    # OpenAI-compatible format (defined last so the methods exist)
+    _HEADER_BUILDERS = {
+        "openrouter": _openrouter_headers,
+        "anthropic": _anthropic_headers,
+    }
+
+    _HANDLERS = {
+        "anthropic": _get_anthropic_response,
+        "google": _get_google_response,
+        "huggingface": _get_huggingface_response,
+    }
+
+    _STREAM_HANDLERS = {
+        "anthropic": _stream_anthropic_response,
+        "google": _stream_full_response,
+        "huggingface": _stream_full_response,
+    }
\ No newline at end of file
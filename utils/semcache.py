@@ -0,0 +1,132 @@
+"""
+Semantic response cache for TermChat
+Short-circuits repeat questions without hitting the remote LLM
+"""
+from typing import Optional
+
+# Embedding support is optional: without numpy + sentence-transformers the
+# cache falls back to exact (normalized) matching instead of disabling itself
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    np = None
+    SentenceTransformer = None
+    EMBEDDINGS_AVAILABLE = False
+
+# Small, fast 384-dimension embedding model
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class SemCache:
+    """Cache of prior (query, response) pairs matched by cosine similarity"""
+
+    def __init__(self, threshold: float = 0.85, quantization: str = "fp32"):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            quantization: How to store embeddings - "fp32" (exact), "int8"
+                (4x smaller) or "binary" (32x smaller, lowest recall)
+        """
+        if quantization not in ("fp32", "int8", "binary"):
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+
+        self.threshold = threshold
+        self.quantization = quantization
+        self._responses = []
+        self._matrix = None  # (N, D) matrix of quantized query embeddings
+        self._model = None
+        self._exact = {}  # Normalized-text fallback when embeddings unavailable
+
+    def _embed(self, text: str):
+        """Embed text as a unit-length float32 vector (or None if unavailable)"""
+        if not EMBEDDINGS_AVAILABLE:
+            return None
+
+        if self._model is None:
+            # Loaded lazily so startup doesn't pay for the model
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+
+        vector = self._model.encode(text).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def _quantize(self, vector):
+        """Quantize a normalized embedding for storage"""
+        if self.quantization == "int8":
+            # Components of a unit vector lie in [-1, 1], so scale by 127
+            return (vector * 127).astype(np.int8)
+        if self.quantization == "binary":
+            # Keep only the sign bits, packed 8 per byte (384 -> 48 bytes)
+            return np.packbits(vector > 0)
+        return vector
+
+    def _scores(self, vector):
+        """Approximate cosine similarity of a query against all stored rows"""
+        if self.quantization == "int8":
+            # int32 accumulation; numpy dispatches to SIMD integer kernels
+            query = (vector * 127).astype(np.int8)
+            dots = self._matrix.astype(np.int32) @ query.astype(np.int32)
+            return dots / (127.0 * 127.0)
+        if self.quantization == "binary":
+            # Hamming distance via XOR + popcount over the packed bits
+            query = np.packbits(vector > 0)
+            hamming = np.unpackbits(self._matrix ^ query, axis=1).sum(axis=1)
+            dim = vector.shape[0]
+            return (dim - 2.0 * hamming) / dim
+        return self._matrix @ vector
+
+    def get(self, query: str) -> Optional[str]:
+        """
+        Look up a cached response for a semantically similar query
+
+        Args:
+            query: The user's input text
+
+        Returns:
+            The cached response text, or None on a cache miss
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            return self._exact.get(query.lower().strip())
+
+        if self._matrix is None:
+            return None
+
+        vector = self._embed(query)
+        # Rows encode unit vectors, so the dot product is cosine similarity
+        scores = self._scores(vector)
+        best = int(np.argmax(scores))
+
+        if scores[best] >= self.threshold:
+            return self._responses[best]
+        return None
+
+    def put(self, query: str, response: str) -> None:
+        """
+        Store a (query, response) pair in the cache
+
+        Args:
+            query: The user's input text
+            response: The LLM's response text
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            self._exact[query.lower().strip()] = response
+            return
+
+        row = self._quantize(self._embed(query))
+        if self._matrix is None:
+            self._matrix = row.reshape(1, -1)
+        else:
+            self._matrix = np.vstack([self._matrix, row])
+        self._responses.append(response)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._responses.clear()
+        self._matrix = None
+        self._exact.clear()
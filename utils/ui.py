@@ -5,9 +5,15 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.table import Table
+from rich.text import Text
 from rich.box import ROUNDED
+from rich.style import Style
 from datetime import datetime
-import random
+
+# Shared console singleton; every module talking to the same terminal
+# should reuse one Console instead of paying its construction cost
+# (terminal detection, encoding probing) per instance
+CONSOLE = Console()
 
 # Color themes for response panels
 THEMES = [
@@ -18,6 +24,14 @@ THEMES = [
     {"border": "magenta", "title": "magenta"}
 ]
 
+# Parse each border style once so Rich doesn't re-parse the string per panel
+for _theme in THEMES:
+    _theme["border_style"] = Style.parse(_theme["border"])
+
+# Characters that suggest Markdown formatting; built once so the hot
+# check below is a membership scan over a constant
+_MARKDOWN_MARKERS = "*_`#[>|"
+
 def create_chat_header(console: Console) -> None:
     """
     Create and display the chat header
@@ -40,22 +54,35 @@ def create_chat_header(console: Console) -> None:
     console.print(table)
     console.print()
 
+def has_markdown_syntax(text: str) -> bool:
+    """
+    Check whether text contains any Markdown-looking characters
+
+    Args:
+        text: The text to check
+
+    Returns:
+        True if the text may contain Markdown formatting
+    """
+    return any(c in text for c in _MARKDOWN_MARKERS)
+
 def format_ai_response(text: str, console: Console) -> None:
     """
     Format and display the AI's response in a nice panel with markdown support
-    
+
     Args:
         text: The AI's response text
         console: Rich console instance
     """
-    # Select a random theme
-    theme = random.choice(THEMES)
-    
-    # Create panel with markdown-formatted text
-    md = Markdown(text)
+    # Deterministic theme pick: the same response text always gets the
+    # same theme within a session, without RNG or shared iterator state
+    theme = THEMES[hash(text) % len(THEMES)]
+
+    # Plain text skips the Markdown parse entirely; the panel is unchanged
+    md = Markdown(text) if has_markdown_syntax(text) else Text(text)
     panel = Panel(
         md,
-        border_style=theme["border"],
+        border_style=theme["border_style"],
         title="Response",
         title_align="left",
         padding=(1, 2)